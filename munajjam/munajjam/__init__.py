@@ -27,7 +27,17 @@ from munajjam.models import (
     Surah,
 )
 from munajjam.config import MunajjamSettings, get_settings, configure
-from munajjam.formatting import format_result, format_results
+from munajjam.formatting import (
+    dumps,
+    dumps_msgpack,
+    format_result,
+    format_result_cached,
+    format_results,
+    format_results_json,
+    format_results_soa,
+    format_results_to_file,
+    iter_format_results,
+)
 from munajjam.exceptions import (
     MunajjamError,
     TranscriptionError,
@@ -53,8 +63,15 @@ __all__ = [
     "get_settings",
     "configure",
     # Formatting
+    "dumps",
+    "dumps_msgpack",
     "format_result",
+    "format_result_cached",
     "format_results",
+    "format_results_json",
+    "format_results_soa",
+    "format_results_to_file",
+    "iter_format_results",
     # Exceptions
     "MunajjamError",
     "TranscriptionError",
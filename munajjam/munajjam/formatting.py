@@ -4,14 +4,110 @@ Canonical JSON formatting for alignment results.
 Provides a single, consistent schema for serializing AlignmentResult
 objects to JSON-ready dicts. All consumers should use these functions
 instead of hand-rolling their own dict structures.
+
+When orjson is installed, byte-oriented helpers such as
+``format_results_json`` use it for serialization; otherwise they fall
+back to the standard library ``json`` module.
+
+For serialized output, :func:`format_results_json` is the recommended
+entry point: it hands the whole payload to the serializer in a single
+call, which keeps array-heavy output on orjson's fast path. Reach for
+:func:`format_results_to_file` only when the payload is too large to
+hold in memory, and for :func:`format_results` /
+:func:`iter_format_results` when you need the dicts themselves.
 """
 
-from __future__ import annotations
+import json
+import operator
+import sys
+import weakref
+from collections.abc import Iterable, Iterator
+from math import floor
+from typing import BinaryIO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is absent
+    orjson = None  # type: ignore
+
+from munajjam.models import AlignmentResult
+
+# Batch sizes below this use the plain Python loop; above it, the
+# vectorized numpy path wins despite the extra array setup.
+_NUMPY_BATCH_THRESHOLD = 64
 
-from typing import TYPE_CHECKING
+# Precomputed rounding scales for common precisions, so the default
+# precision=3 path never evaluates 10**precision at call time.
+_SCALES: tuple[int, ...] = tuple(10**p for p in range(7))
+
+
+def _scale_for(precision: int) -> int:
+    """Validate precision and return its rounding scale."""
+    if precision < 0:
+        raise ValueError(f"precision must be non-negative, got {precision}")
+    if precision < len(_SCALES):
+        return _SCALES[precision]
+    return int(10**precision)
 
-if TYPE_CHECKING:
-    from munajjam.models import AlignmentResult
+
+# Canonical output keys, in schema order.
+_KEYS = (
+    "ayah_number",
+    "surah_id",
+    "start_time",
+    "end_time",
+    "duration",
+    "transcribed_text",
+    "reference_text",
+    "similarity_score",
+    "is_high_confidence",
+    "overlap_detected",
+)
+
+# Fixed-layout template: copying it pre-sizes the output dict's hash
+# table for all ten keys, so per-result construction skips the resize
+# a growing dict literal would trigger.
+_TEMPLATE = dict.fromkeys(_KEYS)
+
+# Extracts all source attributes (dotted lookups included) in one
+# C-level call instead of separate LOAD_ATTR dispatches per field.
+_GET = operator.attrgetter(
+    "ayah.ayah_number",
+    "ayah.surah_id",
+    "ayah.text",
+    "start_time",
+    "end_time",
+    "transcribed_text",
+    "similarity_score",
+    "is_high_confidence",
+    "overlap_detected",
+)
+
+
+def _format_result_fast(result: AlignmentResult, scale: int) -> dict:
+    """Format one result using a precomputed rounding scale.
+
+    ``floor(v * scale + 0.5) / scale`` rounds half-up (ties toward
+    +inf) while avoiding a ``round()`` call per field. floor rather
+    than int keeps the formula correct for negative values — duration
+    can dip below zero, since the model validates only that start and
+    end are each non-negative. This agrees with ``round(v, precision)``
+    except on exact binary ties, where ``round()`` rounds to even
+    (2.0625 at precision 3 formats as 2.063 here, 2.062 via ``round()``).
+    """
+    number, surah, text, s, e, transcribed, score, high_conf, overlap = _GET(result)
+    out = _TEMPLATE.copy()
+    out["ayah_number"] = number
+    out["surah_id"] = surah
+    out["start_time"] = floor(s * scale + 0.5) / scale
+    out["end_time"] = floor(e * scale + 0.5) / scale
+    out["duration"] = floor((e - s) * scale + 0.5) / scale
+    out["transcribed_text"] = transcribed
+    out["reference_text"] = sys.intern(text)
+    out["similarity_score"] = floor(score * scale + 0.5) / scale
+    out["is_high_confidence"] = high_conf
+    out["overlap_detected"] = overlap
+    return out
 
 
 def format_result(result: AlignmentResult, precision: int = 3) -> dict:
@@ -38,20 +134,105 @@ def format_result(result: AlignmentResult, precision: int = 3) -> dict:
             }
 
     """
-    if precision < 0:
-        raise ValueError(f"precision must be non-negative, got {precision}")
-    return {
-        "ayah_number": result.ayah.ayah_number,
-        "surah_id": result.ayah.surah_id,
-        "start_time": round(result.start_time, precision),
-        "end_time": round(result.end_time, precision),
-        "duration": round(result.duration, precision),
-        "transcribed_text": result.transcribed_text,
-        "reference_text": result.ayah.text,
-        "similarity_score": round(result.similarity_score, precision),
-        "is_high_confidence": result.is_high_confidence,
-        "overlap_detected": result.overlap_detected,
-    }
+    return _format_result_fast(result, _scale_for(precision))
+
+
+# Memoized format_result outputs, keyed by (id(result), precision).
+# Entries are evicted when the source result is garbage collected.
+_RESULT_CACHE: dict[tuple[int, int], dict] = {}
+
+
+def format_result_cached(result: AlignmentResult, precision: int = 3) -> dict:
+    """Memoizing variant of :func:`format_result`.
+
+    Useful in pipelines that format the same results repeatedly (e.g.
+    re-emitting overlapping windows): the dict is built once per result
+    and served from cache afterwards. AlignmentResult is not hashable,
+    so entries are keyed by object identity and dropped automatically
+    when the result is garbage collected.
+
+    The returned dict is shared between calls and must not be mutated;
+    results themselves are treated as immutable after construction.
+
+    Args:
+        result: The alignment result to format.
+        precision: Number of decimal places for float rounding (default 3).
+
+    Returns:
+        The same canonical dict as :func:`format_result`.
+    """
+    key = (id(result), precision)
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    out = format_result(result, precision)
+    _RESULT_CACHE[key] = out
+    weakref.finalize(result, _RESULT_CACHE.pop, key, None)
+    return out
+
+
+def iter_format_results(
+    results: Iterable[AlignmentResult],
+    *,
+    precision: int = 3,
+) -> Iterator[dict]:
+    """Lazily yield canonical dicts for each AlignmentResult.
+
+    Unlike :func:`format_results`, this never materializes the whole
+    list of dicts, so callers that stream — e.g. feeding
+    ``json.JSONEncoder().iterencode()`` or writing NDJSON line by line —
+    keep peak memory flat regardless of batch size.
+
+    Args:
+        results: Alignment results to format (any iterable).
+        precision: Number of decimal places for float rounding (default 3).
+
+    Yields:
+        One canonical dict per result, in input order.
+    """
+    scale = _scale_for(precision)
+    return (_format_result_fast(r, scale) for r in results)
+
+
+def _format_results_batch(results: list[AlignmentResult], precision: int) -> list[dict]:
+    """Format a large batch with numpy-vectorized float rounding.
+
+    Rounds all start/end/duration/score values in four vectorized calls
+    over contiguous doubles instead of scalar arithmetic per result.
+    ``floor(v * scale + 0.5)`` is the vectorized form of the scalar
+    paths' half-up rounding, so batch size never changes the output.
+    """
+    import numpy as np
+
+    n = len(results)
+    scale = _scale_for(precision)
+    starts = np.fromiter((r.start_time for r in results), dtype=np.float64, count=n)
+    ends = np.fromiter((r.end_time for r in results), dtype=np.float64, count=n)
+    scores = np.fromiter((r.similarity_score for r in results), dtype=np.float64, count=n)
+
+    # tolist() converts each column to native floats in one C call,
+    # instead of an indexing + .item() round-trip per element.
+    starts_r = (np.floor(starts * scale + 0.5) / scale).tolist()
+    ends_r = (np.floor(ends * scale + 0.5) / scale).tolist()
+    durations_r = (np.floor((ends - starts) * scale + 0.5) / scale).tolist()
+    scores_r = (np.floor(scores * scale + 0.5) / scale).tolist()
+
+    output_list = []
+    for i, r in enumerate(results):
+        ayah = r.ayah
+        out = _TEMPLATE.copy()
+        out["ayah_number"] = ayah.ayah_number
+        out["surah_id"] = ayah.surah_id
+        out["start_time"] = starts_r[i]
+        out["end_time"] = ends_r[i]
+        out["duration"] = durations_r[i]
+        out["transcribed_text"] = r.transcribed_text
+        out["reference_text"] = sys.intern(ayah.text)
+        out["similarity_score"] = scores_r[i]
+        out["is_high_confidence"] = r.is_high_confidence
+        out["overlap_detected"] = r.overlap_detected
+        output_list.append(out)
+    return output_list
 
 
 def format_results(
@@ -78,12 +259,238 @@ def format_results(
                 "ayahs": [...]         # list of formatted results
             }
     """
-    if precision < 0:
-        raise ValueError(f"precision must be non-negative, got {precision}")
-    output: dict = {}
+    scale = _scale_for(precision)
+    meta: dict = {}
     if surah_id is not None:
-        output["surah_id"] = surah_id
+        meta["surah_id"] = surah_id
     if reciter is not None:
-        output["reciter"] = reciter
-    output["ayahs"] = [format_result(r, precision) for r in results]
-    return output
+        meta["reciter"] = reciter
+    if len(results) >= _NUMPY_BATCH_THRESHOLD:
+        ayahs = _format_results_batch(results, precision)
+    else:
+        # _format_result_fast inlined to drop a function call per result.
+        ayahs = []
+        append = ayahs.append
+        for r in results:
+            number, surah, text, s, e, transcribed, score, high_conf, overlap = _GET(r)
+            out = _TEMPLATE.copy()
+            out["ayah_number"] = number
+            out["surah_id"] = surah
+            out["start_time"] = floor(s * scale + 0.5) / scale
+            out["end_time"] = floor(e * scale + 0.5) / scale
+            out["duration"] = floor((e - s) * scale + 0.5) / scale
+            out["transcribed_text"] = transcribed
+            out["reference_text"] = sys.intern(text)
+            out["similarity_score"] = floor(score * scale + 0.5) / scale
+            out["is_high_confidence"] = high_conf
+            out["overlap_detected"] = overlap
+            append(out)
+    return {**meta, "ayahs": ayahs}
+
+
+def format_results_soa(
+    results: list[AlignmentResult],
+    *,
+    precision: int = 3,
+) -> dict:
+    """Format results as a columnar dict of lists (structure-of-arrays).
+
+    Analytics consumers that aggregate over scores or durations —
+    ``pd.DataFrame(columns)``, ``np.asarray(columns["durations"])`` —
+    otherwise have to re-transpose the row-oriented ``ayahs`` list.
+    This builds each column directly in one pass over the results.
+
+    Args:
+        results: List of alignment results to format.
+        precision: Number of decimal places for float rounding (default 3).
+
+    Returns:
+        A dict of parallel lists, one per canonical field, with
+        pluralized column names::
+
+            {
+                "ayah_numbers": [int, ...],
+                "surah_ids": [int, ...],
+                "start_times": [float, ...],
+                "end_times": [float, ...],
+                "durations": [float, ...],
+                "transcribed_texts": [str, ...],
+                "reference_texts": [str, ...],
+                "similarity_scores": [float, ...],
+                "is_high_confidence": [bool, ...],
+                "overlap_detected": [bool, ...],
+            }
+    """
+    scale = _scale_for(precision)
+    ayah_numbers: list = []
+    surah_ids: list = []
+    start_times: list = []
+    end_times: list = []
+    durations: list = []
+    transcribed_texts: list = []
+    reference_texts: list = []
+    similarity_scores: list = []
+    is_high_confidence: list = []
+    overlap_detected: list = []
+    for r in results:
+        number, surah, text, s, e, transcribed, score, high_conf, overlap = _GET(r)
+        ayah_numbers.append(number)
+        surah_ids.append(surah)
+        start_times.append(floor(s * scale + 0.5) / scale)
+        end_times.append(floor(e * scale + 0.5) / scale)
+        durations.append(floor((e - s) * scale + 0.5) / scale)
+        transcribed_texts.append(transcribed)
+        reference_texts.append(sys.intern(text))
+        similarity_scores.append(floor(score * scale + 0.5) / scale)
+        is_high_confidence.append(high_conf)
+        overlap_detected.append(overlap)
+    return {
+        "ayah_numbers": ayah_numbers,
+        "surah_ids": surah_ids,
+        "start_times": start_times,
+        "end_times": end_times,
+        "durations": durations,
+        "transcribed_texts": transcribed_texts,
+        "reference_texts": reference_texts,
+        "similarity_scores": similarity_scores,
+        "is_high_confidence": is_high_confidence,
+        "overlap_detected": overlap_detected,
+    }
+
+
+def dumps(payload: object) -> bytes:
+    """Serialize a JSON-ready payload to UTF-8 bytes.
+
+    This is the canonical serializer for formatted output: orjson when
+    installed (it writes UTF-8 directly, so Arabic text never goes
+    through an ASCII-escape pass), the standard library otherwise.
+
+    Args:
+        payload: A JSON-serializable object, typically the output of
+            :func:`format_result` or :func:`format_results`.
+
+    Returns:
+        The payload encoded as UTF-8 JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def format_results_json(
+    results: list[AlignmentResult],
+    *,
+    surah_id: int | None = None,
+    reciter: str | None = None,
+    precision: int = 3,
+) -> bytes:
+    """Serialize a list of AlignmentResults to canonical JSON bytes.
+
+    Builds the same dict as :func:`format_results` and serializes it in a
+    single call. Uses orjson when installed, which writes UTF-8 directly
+    and is significantly faster than the standard library for large
+    result lists; otherwise falls back to ``json.dumps``.
+
+    Args:
+        results: List of alignment results to serialize.
+        surah_id: Optional surah number to include in output.
+        reciter: Optional reciter name to include in output.
+        precision: Number of decimal places for float rounding (default 3).
+
+    Returns:
+        The canonical output dict encoded as UTF-8 JSON bytes. Callers
+        that need ``str`` should decode once at the boundary.
+    """
+    output = format_results(
+        results, surah_id=surah_id, reciter=reciter, precision=precision
+    )
+    return dumps(output)
+
+
+def dumps_msgpack(
+    results: list[AlignmentResult],
+    *,
+    surah_id: int | None = None,
+    reciter: str | None = None,
+    precision: int = 3,
+) -> bytes:
+    """Serialize a list of AlignmentResults to msgpack bytes.
+
+    Encodes the same payload as :func:`format_results_json` in the
+    msgpack binary format, which writes floats as raw IEEE-754 bits
+    instead of decimal strings — faster to encode and ~30% smaller on
+    the wire. Intended for internal service-to-service pipelines; JSON
+    remains the interchange format for external consumers.
+
+    Requires the optional ``msgpack`` dependency.
+
+    Args:
+        results: List of alignment results to serialize.
+        surah_id: Optional surah number to include in output.
+        reciter: Optional reciter name to include in output.
+        precision: Number of decimal places for float rounding (default 3).
+
+    Returns:
+        The canonical output dict encoded as msgpack bytes.
+    """
+    try:
+        import msgpack  # type: ignore
+    except ImportError:
+        raise ImportError(
+            "msgpack not installed. "
+            "Install with: pip install munajjam[msgpack]"
+        )
+
+    output = format_results(
+        results, surah_id=surah_id, reciter=reciter, precision=precision
+    )
+    return msgpack.packb(output, use_bin_type=True)  # type: ignore
+
+
+def format_results_to_file(
+    results: list[AlignmentResult],
+    fp: BinaryIO,
+    *,
+    surah_id: int | None = None,
+    reciter: str | None = None,
+    precision: int = 3,
+) -> None:
+    """Stream formatted results as JSON to a binary file object.
+
+    Writes the same payload as :func:`format_results_json`, but one
+    result at a time, so the full list of dicts and the full JSON byte
+    string are never held in memory at once. Useful for very large
+    surahs or batch exports.
+
+    Per-result serialization gives up orjson's single-call fast path
+    over the ayahs array, so prefer :func:`format_results_json` whenever
+    the payload fits in memory.
+
+    Args:
+        results: List of alignment results to serialize.
+        fp: A binary file-like object open for writing.
+        surah_id: Optional surah number to include in output.
+        reciter: Optional reciter name to include in output.
+        precision: Number of decimal places for float rounding (default 3).
+    """
+    scale = _scale_for(precision)
+    head: dict = {}
+    if surah_id is not None:
+        head["surah_id"] = surah_id
+    if reciter is not None:
+        head["reciter"] = reciter
+    if head:
+        # Reuse the serializer for escaping; swap the closing brace for
+        # the ayahs array opener.
+        fp.write(dumps(head)[:-1] + b',"ayahs":[')
+    else:
+        fp.write(b'{"ayahs":[')
+
+    first = True
+    for result in results:
+        if first:
+            first = False
+        else:
+            fp.write(b",")
+        fp.write(dumps(_format_result_fast(result, scale)))
+    fp.write(b"]}")
@@ -2,11 +2,22 @@
 Unit tests for the canonical JSON formatter.
 """
 
+import io
 import json
 
 import pytest
 from munajjam.models import Ayah, AlignmentResult
-from munajjam.formatting import format_result, format_results
+from munajjam.formatting import (
+    dumps,
+    dumps_msgpack,
+    format_result,
+    format_result_cached,
+    format_results,
+    format_results_json,
+    format_results_soa,
+    format_results_to_file,
+    iter_format_results,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -102,6 +113,18 @@ class TestFormatResult:
         assert out5["start_time"] == round(5.678901234, 5)
         assert out5["similarity_score"] == round(0.956789012, 5)
 
+    def test_format_result_negative_duration(self, sample_ayahs):
+        """A slightly inverted span rounds its negative duration like round()."""
+        result = AlignmentResult(
+            ayah=sample_ayahs[0],
+            start_time=5.0012,
+            end_time=5.0,
+            transcribed_text="بسم الله",
+            similarity_score=0.9,
+        )
+        out = format_result(result)
+        assert out["duration"] == round(5.0 - 5.0012, 3) == -0.001
+
     def test_format_result_overlap_true(self, sample_result_with_overlap):
         """overlap_detected: True propagates correctly."""
         out = format_result(sample_result_with_overlap)
@@ -114,6 +137,57 @@ class TestFormatResult:
         assert isinstance(serialized, str)
         assert len(serialized) > 0
 
+    def test_format_result_dumps_bytes(self, sample_result):
+        """The canonical dumps() serializer emits equivalent UTF-8 bytes."""
+        out = format_result(sample_result)
+        serialized = dumps(out)
+        assert isinstance(serialized, bytes)
+        assert json.loads(serialized) == out
+
+
+# ---------------------------------------------------------------------------
+# format_result_cached tests
+# ---------------------------------------------------------------------------
+
+class TestFormatResultCached:
+    """Tests for format_result_cached()."""
+
+    def test_matches_format_result(self, sample_result):
+        """Cached output equals the uncached formatter's output."""
+        assert format_result_cached(sample_result) == format_result(sample_result)
+
+    def test_returns_same_dict_on_repeat(self, sample_result):
+        """Repeated calls for the same result reuse one dict."""
+        first = format_result_cached(sample_result)
+        second = format_result_cached(sample_result)
+        assert first is second
+
+    def test_precision_keys_cache_separately(self, sample_result):
+        """Different precisions do not share cache entries."""
+        out3 = format_result_cached(sample_result, precision=3)
+        out2 = format_result_cached(sample_result, precision=2)
+        assert out3 is not out2
+        assert out2["start_time"] == round(5.6789, 2)
+
+    def test_entry_evicted_on_gc(self, sample_ayahs):
+        """Cache entries disappear once the result is garbage collected."""
+        import gc
+        from munajjam.formatting import _RESULT_CACHE
+
+        result = AlignmentResult(
+            ayah=sample_ayahs[0],
+            start_time=1.0,
+            end_time=2.0,
+            transcribed_text="بسم الله",
+            similarity_score=0.9,
+        )
+        format_result_cached(result)
+        key = (id(result), 3)
+        assert key in _RESULT_CACHE
+        del result
+        gc.collect()
+        assert key not in _RESULT_CACHE
+
 
 # ---------------------------------------------------------------------------
 # format_results tests
@@ -145,3 +219,175 @@ class TestFormatResults:
         """Returns {'ayahs': []}, no crash."""
         out = format_results([])
         assert out == {"ayahs": []}
+
+    def test_format_results_large_batch_matches_per_result(self, sample_ayahs):
+        """The vectorized large-batch path agrees with format_result()."""
+        results = [
+            AlignmentResult(
+                ayah=sample_ayahs[i % len(sample_ayahs)],
+                start_time=i * 4.0 + 0.1234,
+                end_time=i * 4.0 + 3.6912,
+                transcribed_text="بسم الله الرحمن الرحيم",
+                similarity_score=0.9123,
+                overlap_detected=False,
+            )
+            for i in range(100)
+        ]
+        # Exact binary ties (2.0625 * 1000 == 2062.5) must round the
+        # same way in the batch and scalar paths.
+        results.append(
+            AlignmentResult(
+                ayah=sample_ayahs[0],
+                start_time=2.0625,
+                end_time=7.0625,
+                transcribed_text="بسم الله الرحمن الرحيم",
+                similarity_score=0.5625,
+                overlap_detected=False,
+            )
+        )
+        # Negative durations (end < start is not rejected by the model)
+        # must also round identically in both paths.
+        results.append(
+            AlignmentResult(
+                ayah=sample_ayahs[0],
+                start_time=5.0012,
+                end_time=5.0,
+                transcribed_text="بسم الله",
+                similarity_score=0.9,
+                overlap_detected=False,
+            )
+        )
+        out = format_results(results)
+        assert len(out["ayahs"]) == 102
+        assert out["ayahs"] == [format_result(r) for r in results]
+        assert out["ayahs"][-2]["start_time"] == 2.063
+        assert out["ayahs"][-1]["duration"] == -0.001
+
+
+# ---------------------------------------------------------------------------
+# iter_format_results tests
+# ---------------------------------------------------------------------------
+
+class TestIterFormatResults:
+    """Tests for iter_format_results()."""
+
+    def test_yields_same_dicts_as_format_result(
+        self, sample_result, sample_result_with_overlap
+    ):
+        """Lazy iteration produces the same dicts as format_result()."""
+        results = [sample_result, sample_result_with_overlap]
+        assert list(iter_format_results(results)) == [format_result(r) for r in results]
+
+    def test_is_lazy(self, sample_result):
+        """Returns an iterator, not a list."""
+        it = iter_format_results([sample_result])
+        assert iter(it) is it
+
+    def test_invalid_precision_raises_eagerly(self, sample_result):
+        """Negative precision fails at call time, not first iteration."""
+        with pytest.raises(ValueError):
+            iter_format_results([sample_result], precision=-1)
+
+
+# ---------------------------------------------------------------------------
+# format_results_json tests
+# ---------------------------------------------------------------------------
+
+class TestFormatResultsJson:
+    """Tests for format_results_json()."""
+
+    def test_returns_bytes(self, sample_result):
+        """Output is UTF-8 JSON bytes."""
+        out = format_results_json([sample_result])
+        assert isinstance(out, bytes)
+
+    def test_roundtrip_matches_format_results(self, sample_result, sample_result_with_overlap):
+        """Decoded payload equals the format_results() dict."""
+        results = [sample_result, sample_result_with_overlap]
+        serialized = format_results_json(results, surah_id=1, reciter="Test Reciter")
+        decoded = json.loads(serialized)
+        assert decoded == format_results(results, surah_id=1, reciter="Test Reciter")
+
+    def test_arabic_text_preserved(self, sample_result):
+        """Arabic reference text survives the bytes roundtrip intact."""
+        decoded = json.loads(format_results_json([sample_result]))
+        assert decoded["ayahs"][0]["reference_text"] == sample_result.ayah.text
+
+
+# ---------------------------------------------------------------------------
+# format_results_soa tests
+# ---------------------------------------------------------------------------
+
+class TestFormatResultsSoa:
+    """Tests for format_results_soa()."""
+
+    def test_columns_match_row_output(self, sample_result, sample_result_with_overlap):
+        """Each column holds the same values as the row-oriented dicts."""
+        results = [sample_result, sample_result_with_overlap]
+        columns = format_results_soa(results)
+        rows = [format_result(r) for r in results]
+        assert columns["ayah_numbers"] == [row["ayah_number"] for row in rows]
+        assert columns["start_times"] == [row["start_time"] for row in rows]
+        assert columns["durations"] == [row["duration"] for row in rows]
+        assert columns["similarity_scores"] == [row["similarity_score"] for row in rows]
+        assert columns["overlap_detected"] == [False, True]
+
+    def test_columns_equal_length(self, sample_result):
+        """All columns have one entry per result."""
+        columns = format_results_soa([sample_result])
+        assert all(len(col) == 1 for col in columns.values())
+
+    def test_empty_results(self):
+        """Empty input yields empty columns, not a crash."""
+        columns = format_results_soa([])
+        assert all(col == [] for col in columns.values())
+
+
+# ---------------------------------------------------------------------------
+# dumps_msgpack tests
+# ---------------------------------------------------------------------------
+
+class TestDumpsMsgpack:
+    """Tests for dumps_msgpack()."""
+
+    def test_roundtrip_matches_format_results(self, sample_result):
+        """Unpacked payload equals the format_results() dict."""
+        msgpack = pytest.importorskip("msgpack")
+        packed = dumps_msgpack([sample_result], surah_id=1, reciter="Test Reciter")
+        assert isinstance(packed, bytes)
+        unpacked = msgpack.unpackb(packed, raw=False)
+        assert unpacked == format_results(
+            [sample_result], surah_id=1, reciter="Test Reciter"
+        )
+
+
+# ---------------------------------------------------------------------------
+# format_results_to_file tests
+# ---------------------------------------------------------------------------
+
+class TestFormatResultsToFile:
+    """Tests for format_results_to_file()."""
+
+    def test_streamed_output_matches_format_results(
+        self, sample_result, sample_result_with_overlap
+    ):
+        """Streamed JSON decodes to the same payload as format_results()."""
+        results = [sample_result, sample_result_with_overlap]
+        buf = io.BytesIO()
+        format_results_to_file(results, buf, surah_id=1, reciter="Test Reciter")
+        decoded = json.loads(buf.getvalue())
+        assert decoded == format_results(results, surah_id=1, reciter="Test Reciter")
+
+    def test_empty_list(self):
+        """Empty result list produces a valid empty payload."""
+        buf = io.BytesIO()
+        format_results_to_file([], buf)
+        assert json.loads(buf.getvalue()) == {"ayahs": []}
+
+    def test_without_metadata(self, sample_result):
+        """Metadata keys absent when omitted."""
+        buf = io.BytesIO()
+        format_results_to_file([sample_result], buf)
+        decoded = json.loads(buf.getvalue())
+        assert "surah_id" not in decoded
+        assert "reciter" not in decoded